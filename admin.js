@@ -20,21 +20,47 @@ const OrderStatus = {
 // --- Supabase Interaction Functions ---
 
 /**
- * Fetches the list of all orders, sorted by newest first.
+ * Fetches one page of orders (newest first) from the admin orders API.
+ * Pass the previous page's nextCursor to continue where it left off.
  */
-async function fetchAllOrders() {
-    const { data, error } = await supabaseClient
-        .from('orders')
-        .select('*')
-        .order('created_at', { ascending: false });
+async function fetchOrdersPage(filters, cursor = null) {
+    const sessionToken = sessionStorage.getItem('session_token');
+    
+    try {
+        const response = await fetch(`${window.location.origin}/api/admin/orders`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                session_token: sessionToken,
+                status: filters.status,
+                phone: filters.phone || null,
+                short_id: filters.shortId || null,
+                cursor: cursor
+            })
+        });
 
-    if (error) {
+        const result = await response.json();
+
+        if (!response.ok || !result.success) {
+            console.error('Error fetching orders:', result.error);
+            return { orders: [], nextCursor: null };
+        }
+        
+        return { orders: result.orders.map(mapOrder), nextCursor: result.next_cursor };
+        
+    } catch (error) {
         console.error('Error fetching orders:', error);
-        return [];
+        return { orders: [], nextCursor: null };
     }
-    
-    // Map data fields from snake_case to camelCase for existing JS compatibility
-    return data.map(o => ({
+}
+
+/**
+ * Maps an order row from snake_case to camelCase for existing JS compatibility.
+ */
+function mapOrder(o) {
+    return {
         id: o.id,
         shortId: o.short_id,
         customerPhone: o.customer_phone,
@@ -44,7 +70,7 @@ async function fetchAllOrders() {
         status: o.status,
         createdAt: new Date(o.created_at),
         updatedAt: o.updated_at ? new Date(o.updated_at) : null,
-    }));
+    };
 }
 
 /**
@@ -89,12 +115,50 @@ async function updateOrderStatus(orderId, newStatus) {
     }
 }
 
+/**
+ * Updates many orders' status in one request; returns per-order results.
+ */
+async function bulkUpdateOrderStatus(orderIds, newStatus) {
+    try {
+        const sessionToken = sessionStorage.getItem('session_token');
+        
+        if (!sessionToken) {
+            console.error('No session token found - user may need to re-login');
+            return { success: false, error: 'Not authenticated' };
+        }
+        
+        const response = await fetch(`${window.location.origin}/api/admin/orders/bulk-status`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                order_ids: orderIds,
+                status: newStatus,
+                session_token: sessionToken
+            })
+        });
+
+        const result = await response.json();
+        
+        if (!response.ok || !result.success) {
+            console.error('Error bulk updating order status:', result.error);
+            return { success: false, error: result.error };
+        }
+        
+        return { success: true, updated: result.updated, results: result.results };
+        
+    } catch (error) {
+        console.error('Error bulk updating order status:', error);
+        return { success: false, error: error.message };
+    }
+}
+
 /**
  * SECURITY: fetchAdminToken() has been removed to prevent admin token leak.
  * Admin authentication now happens server-side via /api/admin/login endpoint.
  * 
  * WARNING: The following operations still use Supabase anonymous client and are NOT fully secured:
- * - fetchAllOrders() - Anyone can read all orders
  * - fetchAllPackages() - Anyone can read/modify packages
  * - fetchSettings() - Anyone can read settings (except admin_token which is now blocked)
  * - updateSettings() - Anyone can modify WhatsApp link
@@ -128,6 +192,54 @@ async function fetchAllPackages() {
     }));
 }
 
+/**
+ * Tells the server to reload its cached package catalog so checkouts
+ * immediately use the edited prices.
+ */
+async function refreshServerPackageCache() {
+    try {
+        const response = await fetch(`${window.location.origin}/api/admin/refresh-packages`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                session_token: sessionStorage.getItem('session_token')
+            })
+        });
+        
+        if (!response.ok) {
+            console.error('Error refreshing server package cache:', response.status);
+        }
+    } catch (error) {
+        console.error('Error refreshing server package cache:', error);
+    }
+}
+
+/**
+ * Tells the server to reload its cached admin credential from the settings
+ * table, so a rotated admin token takes effect on every worker right away.
+ */
+async function refreshServerSettingsCache() {
+    try {
+        const response = await fetch(`${window.location.origin}/api/admin/refresh-settings`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                session_token: sessionStorage.getItem('session_token')
+            })
+        });
+        
+        if (!response.ok) {
+            console.error('Error refreshing server settings cache:', response.status);
+        }
+    } catch (error) {
+        console.error('Error refreshing server settings cache:', error);
+    }
+}
+
 /**
  * Saves a new or updated package.
  */
@@ -149,6 +261,7 @@ async function savePackage(pkg) {
         console.error('Error saving package:', error);
         return { success: false };
     }
+    await refreshServerPackageCache();
     renderPackageEditor();
     return { success: true };
 }
@@ -166,6 +279,7 @@ async function deletePackage(pkgId) {
         console.error('Error deleting package:', error);
         return { success: false };
     }
+    await refreshServerPackageCache();
     renderPackageEditor();
     return { success: true };
 }
@@ -201,6 +315,7 @@ async function updateSettings(newSettings) {
         console.error('Error updating settings:', error);
         return { success: false };
     }
+    await refreshServerSettingsCache();
     renderSettingsEditor();
     return { success: true };
 }
@@ -208,6 +323,7 @@ async function updateSettings(newSettings) {
 // --- BULK PROCESSING TOOLS (REMAINS SAME LOGIC, BUT USES LIVE DATA) ---
 
 let currentOrders = []; // Cached array for filtered orders
+let nextOrdersCursor = null; // Keyset cursor for the next page of orders
 
 /**
  * Gets the IDs of all checked orders.
@@ -239,21 +355,58 @@ function toggleSelectAll(masterCheckbox) {
 }
 
 /**
- * Handles filtering the order table by status.
+ * Reads the current filters: status dropdown plus the search box, which
+ * matches a tracking ID prefix (e.g. a00) or a phone number prefix.
+ */
+function getOrderFilters() {
+    const search = (document.getElementById('order-search')?.value || '').trim().toLowerCase();
+    return {
+        status: document.getElementById('filter-status').value,
+        shortId: /^[a-z]\d{0,4}$/.test(search) ? search : null,
+        phone: /^\+?\d+$/.test(search) ? search : null
+    };
+}
+
+/**
+ * Handles filtering the order table (filtering happens on the server).
  */
 async function filterOrders() {
-    const statusFilter = document.getElementById('filter-status').value;
-    const allOrders = await fetchAllOrders();
+    const { orders, nextCursor } = await fetchOrdersPage(getOrderFilters());
     
-    let filteredOrders;
-    if (statusFilter === 'ALL') {
-        filteredOrders = allOrders;
-    } else {
-        filteredOrders = allOrders.filter(order => order.status === statusFilter);
-    }
+    currentOrders = orders; // Cache the filtered result
+    nextOrdersCursor = nextCursor;
+    renderOrderTable(currentOrders);
+    updateLoadMoreButton();
+}
+
+/**
+ * Appends the next page of orders to the table, keeping selections.
+ */
+async function loadMoreOrders() {
+    if (!nextOrdersCursor) return;
+    
+    const selectedIds = getSelectedOrderIds();
+    const { orders, nextCursor } = await fetchOrdersPage(getOrderFilters(), nextOrdersCursor);
+    
+    currentOrders = currentOrders.concat(orders);
+    nextOrdersCursor = nextCursor;
+    renderOrderTable(currentOrders);
+    updateLoadMoreButton();
     
-    currentOrders = filteredOrders; // Cache the filtered result
-    renderOrderTable(filteredOrders);
+    selectedIds.forEach(id => {
+        const checkbox = document.querySelector(`#orders-table-body .order-checkbox[data-order-id="${id}"]`);
+        if (checkbox) checkbox.checked = true;
+    });
+}
+
+/**
+ * Shows the "Load More" button only while more pages exist.
+ */
+function updateLoadMoreButton() {
+    const loadMoreBtn = document.getElementById('load-more-orders');
+    if (loadMoreBtn) {
+        loadMoreBtn.style.display = nextOrdersCursor ? 'inline-block' : 'none';
+    }
 }
 
 /**
@@ -277,13 +430,15 @@ async function handleBulkStatusChange() {
         return;
     }
 
-    let successCount = 0;
-    for (const id of selectedOrders) {
-        const result = await updateOrderStatus(id, newStatus); 
-        if(result.success) successCount++;
+    const result = await bulkUpdateOrderStatus(selectedOrders, newStatus);
+    
+    if (result.success) {
+        const failedCount = selectedOrders.length - result.updated;
+        alert(`${result.updated} orders successfully updated to ${newStatus}.` +
+            (failedCount > 0 ? ` ${failedCount} could not be updated.` : ''));
+    } else {
+        alert('Failed to update orders: ' + (result.error || 'Unknown error'));
     }
-
-    alert(`${successCount} orders successfully updated to ${newStatus}.`);
     // Re-render the table after the batch update is complete
     filterOrders();
 }
@@ -322,6 +477,55 @@ function exportOrdersToCSV() {
     alert(`Exported ${selectedOrders.length} orders to CSV for bulk loading.`);
 }
 
+/**
+ * Downloads every order matching the status filter and date range as CSV.
+ * The server streams the file page by page, so it works for any order count.
+ */
+async function exportFilteredOrdersToCSV() {
+    const sessionToken = sessionStorage.getItem('session_token');
+    if (!sessionToken) {
+        alert('Session expired. Please log in again.');
+        return;
+    }
+
+    try {
+        const response = await fetch(`${window.location.origin}/api/admin/orders/export`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                session_token: sessionToken,
+                status: document.getElementById('filter-status').value,
+                date_from: document.getElementById('export-date-from').value || null,
+                date_to: document.getElementById('export-date-to').value || null
+            })
+        });
+
+        if (!response.ok) {
+            const result = await response.json();
+            alert('Failed to export orders: ' + (result.error || response.status));
+            return;
+        }
+
+        const blob = await response.blob();
+        const link = document.createElement("a");
+        const url = URL.createObjectURL(blob);
+        const date = new Date().toISOString().split('T')[0];
+
+        link.setAttribute("href", url);
+        link.setAttribute("download", `DataGod_Bulk_Load_${date}.csv`);
+        link.style.visibility = 'hidden';
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        URL.revokeObjectURL(url);
+    } catch (error) {
+        console.error('Error exporting orders:', error);
+        alert('Failed to export orders. Please try again.');
+    }
+}
+
 // --- CONFIGURATION RENDERING AND LOGIC (UPDATED DB CALLS) ---
 
 /**
@@ -635,6 +839,13 @@ document.addEventListener('DOMContentLoaded', () => {
     if (filterSelect) {
         filterSelect.addEventListener('change', filterOrders);
     }
+    
+    const searchInput = document.getElementById('order-search');
+    if (searchInput) {
+        searchInput.addEventListener('keydown', (event) => {
+            if (event.key === 'Enter') filterOrders();
+        });
+    }
 
     const packageForm = document.getElementById('package-form');
     if (packageForm) {
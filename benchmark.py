@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+"""
+Load benchmark for server.py against local stand-ins for Supabase and Paystack.
+
+Starts an in-memory fake PostgREST (orders, packages, settings and the
+reserve_short_id_block RPC) and a fake Paystack (transaction/initialize,
+transaction/verify), both with injected latency, launches server.py
+pointed at them and reports requests/sec and p50/p95/p99 per scenario.
+Nothing touches the live services.
+
+    python benchmark.py                                  # every scenario
+    python benchmark.py checkout verify --requests 1000 --concurrency 64
+    python benchmark.py --supabase-latency 0.08 --paystack-latency 0.4 --json results.json
+    python benchmark.py webhook --worker-processes 0      # prefork server, one worker process per CPU
+    python benchmark.py --fakes-only                     # run the fakes for a manually started server
+"""
+import argparse
+import hashlib
+import hmac
+import http.client
+import http.server
+import json
+import operator
+import os
+import random
+import re
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, unquote, urlparse
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+PAYSTACK_SECRET_KEY = 'sk_test_benchmark'
+ADMIN_TOKEN = 'benchmark-admin-token'
+SCENARIOS = ('checkout', 'verify', 'webhook', 'admin-bulk')
+
+PACKAGES = [
+    {'id': i, 'package_name': f'{gb}GB', 'data_value_gb': gb, 'price_ghs': price, 'is_enabled': True}
+    for i, (gb, price) in enumerate([(1, 5.5), (2, 10.0), (5, 23.0), (10, 44.0), (20, 85.0)], start=1)
+]
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 256
+
+
+# --- Fake upstreams ---
+
+class FakeDatabase:
+    """In-memory tables for the PostgREST subset server.py uses"""
+
+    def __init__(self):
+        self.tables = {
+            'orders': [],
+            'packages': [dict(p) for p in PACKAGES],
+            'settings': [{'id': 1, 'admin_token': ADMIN_TOKEN, 'whats_app_link': ''}],
+        }
+        self.next_short_id = 0
+        self.lock = threading.Lock()
+
+
+def now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def split_top_level(text):
+    """Split on commas that are not inside parentheses or quotes"""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == '(':
+            depth += 1
+        elif not quoted and char == ')':
+            depth -= 1
+        elif not quoted and char == ',' and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def make_predicate(column, op, value):
+    """Build a row predicate for one PostgREST operator; values compare as strings (ISO timestamps, UUIDs) or numbers"""
+    value = value.strip('"')
+    if op == 'is':
+        return lambda row: row.get(column) is None if value == 'null' else str(row.get(column)).lower() == value
+    if op == 'eq':
+        return lambda row: str(row.get(column)) == value
+    if op == 'neq':
+        return lambda row: str(row.get(column)) != value
+    if op == 'in':
+        values = {v.strip('"') for v in split_top_level(value.strip('()'))}
+        return lambda row: str(row.get(column)) in values
+    if op == 'like':
+        pattern = re.compile(re.escape(value).replace(r'\*', '.*'))
+        return lambda row: pattern.fullmatch(str(row.get(column))) is not None
+    if op in ('lt', 'lte', 'gt', 'gte'):
+        compare = {'lt': operator.lt, 'lte': operator.le, 'gt': operator.gt, 'gte': operator.ge}[op]
+        try:
+            number = float(value)
+        except ValueError:
+            number = None
+
+        def predicate(row):
+            cell = row.get(column)
+            if cell is None:
+                return False
+            if number is not None and isinstance(cell, (int, float)):
+                return compare(cell, number)
+            return compare(str(cell), value)
+        return predicate
+    raise ValueError(f'Unsupported operator {op}')
+
+
+def parse_condition(expr):
+    """Turn 'col.op.value', 'and(...)' or 'or(...)' into a row predicate"""
+    for kind, combine in (('and(', all), ('or(', any)):
+        if expr.startswith(kind):
+            conditions = [parse_condition(part) for part in split_top_level(expr[len(kind):-1])]
+            return lambda row: combine(condition(row) for condition in conditions)
+    column, op, value = expr.split('.', 2)
+    return make_predicate(column, op, value)
+
+
+def parse_query(query):
+    """Split a PostgREST query string into predicates and select/order/limit options"""
+    predicates, options = [], {}
+    for key, value in parse_qsl(query, keep_blank_values=True):
+        if key in ('select', 'order', 'limit', 'offset'):
+            options[key] = value
+        elif key in ('or', 'and'):
+            predicates.append(parse_condition(f'{key}{value}'))
+        else:
+            op, _, operand = value.partition('.')
+            predicates.append(make_predicate(key, op, operand))
+    return predicates, options
+
+
+def project(rows, select):
+    if not select or select == '*' or select == 'count':
+        return [dict(row) for row in rows]
+    columns = select.split(',')
+    return [{column: row.get(column) for column in columns} for row in rows]
+
+
+def order_rows(rows, order):
+    for clause in reversed((order or '').split(',')):
+        if clause:
+            column, _, direction = clause.partition('.')
+            rows.sort(key=lambda row: str(row.get(column)), reverse=direction.startswith('desc'))
+    return rows
+
+
+class FakeUpstreamHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real services
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't add delayed-ACK stalls
+    latency = 0.0
+    jitter = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def delay(self):
+        if self.latency:
+            time.sleep(max(0.0, random.gauss(self.latency, self.latency * self.jitter)))
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length) or b'null')
+
+    def send_json(self, status, payload, headers=None):
+        body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+
+class FakeSupabaseHandler(FakeUpstreamHandler):
+    db = None
+
+    def dispatch(self):
+        self.delay()
+        parsed = urlparse(self.path)
+        if not parsed.path.startswith('/rest/v1/'):
+            return self.send_json(404, {'message': 'not found'})
+        name = unquote(parsed.path[len('/rest/v1/'):])
+        if name == 'rpc/reserve_short_id_block':
+            block_size = int(self.read_json()['block_size'])
+            with self.db.lock:
+                start = self.db.next_short_id
+                self.db.next_short_id += block_size
+            return self.send_json(200, start)
+        if name not in self.db.tables:
+            return self.send_json(404, {'message': f'relation {name} does not exist'})
+        predicates, options = parse_query(parsed.query)
+        prefer = self.headers.get('Prefer', '')
+        table = self.db.tables[name]
+
+        with self.db.lock:
+            if self.command == 'POST':
+                payload = self.read_json()
+                rows = payload if isinstance(payload, list) else [payload]
+                created = []
+                for row in rows:
+                    row = dict(row)
+                    row.setdefault('id', str(uuid.uuid4()))
+                    row.setdefault('created_at', now())
+                    row.setdefault('updated_at', row['created_at'])
+                    table.append(row)
+                    created.append(row)
+                result, status = project(created, options.get('select')), 201
+            else:
+                matched = [row for row in table if all(predicate(row) for predicate in predicates)]
+                if self.command == 'DELETE':
+                    table[:] = [row for row in table if not any(row is match for match in matched)]
+                    result, status = project(matched, options.get('select')), 200
+                elif self.command == 'PATCH':
+                    changes = dict(self.read_json(), updated_at=now())  # Like the updated_at trigger
+                    for row in matched:
+                        row.update(changes)
+                    result, status = project(matched, options.get('select')), 200
+                else:
+                    matched = order_rows(matched, options.get('order'))
+                    total = len(matched)
+                    offset = int(options.get('offset', 0))
+                    limit = int(options['limit']) if 'limit' in options else None
+                    matched = matched[offset:offset + limit if limit is not None else None]
+                    result, status = project(matched, options.get('select')), 200
+
+        headers = {}
+        if 'count=exact' in prefer and self.command in ('GET', 'HEAD'):
+            headers['Content-Range'] = f'0-{max(total - 1, 0)}/{total}' if total else '*/0'
+        if self.command in ('POST', 'PATCH', 'DELETE') and 'return=representation' not in prefer:
+            result = None
+            status = 201 if self.command == 'POST' else 204
+        self.send_json(status, result, headers)
+
+    do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = dispatch
+
+
+class FakePaystackHandler(FakeUpstreamHandler):
+    transactions = None  # Format: {reference: transaction}; every charge succeeds as soon as it's initialized
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.delay()
+        if urlparse(self.path).path != '/transaction/initialize':
+            return self.send_json(404, {'status': False, 'message': 'not found'})
+        payload = self.read_json()
+        with self.lock:
+            self.transactions[payload['reference']] = {
+                'id': len(self.transactions) + 1,
+                'status': 'success',
+                'reference': payload['reference'],
+                'amount': payload['amount'],
+                'currency': 'GHS',
+                'created_at': now(),
+            }
+        self.send_json(200, {'status': True, 'message': 'Authorization URL created', 'data': {
+            'authorization_url': f'https://checkout.paystack.test/{payload["reference"]}',
+            'access_code': uuid.uuid4().hex[:15],
+            'reference': payload['reference'],
+        }})
+
+    def do_GET(self):
+        self.delay()
+        parsed = urlparse(self.path)
+        if parsed.path == '/transaction':
+            return self.list_transactions(dict(parse_qsl(parsed.query)))
+        match = re.fullmatch(r'/transaction/verify/([^/?]+)', parsed.path)
+        transaction = self.transactions.get(match.group(1)) if match else None
+        if transaction is None:
+            return self.send_json(400, {'status': False, 'message': 'Transaction reference not found'})
+        self.send_json(200, {'status': True, 'message': 'Verification successful', 'data': transaction})
+
+    def list_transactions(self, query):
+        """Newest-first pages of transactions, filtered like Paystack's status/from/to parameters"""
+        per_page, page = int(query.get('perPage', 50)), int(query.get('page', 1))
+        since, until = query.get('from', ''), query.get('to', '\uffff')
+        with self.lock:
+            matched = [t for t in self.transactions.values()
+                       if query.get('status') in (None, t['status']) and since <= t['created_at'] <= until]
+        matched.sort(key=lambda t: t['created_at'], reverse=True)
+        page_count = max(1, -(-len(matched) // per_page))
+        self.send_json(200, {
+            'status': True,
+            'data': matched[(page - 1) * per_page:page * per_page],
+            'meta': {'total': len(matched), 'perPage': per_page, 'page': page, 'pageCount': page_count},
+        })
+
+
+def start_fake(handler_class, **attributes):
+    handler = type(handler_class.__name__, (handler_class,), attributes)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+# --- Load generation ---
+
+class Client:
+    """One keep-alive connection per load thread"""
+
+    def __init__(self, base_url):
+        parsed = urlparse(base_url)
+        self.host, self.port = parsed.hostname, parsed.port
+        self.local = threading.local()
+
+    def post(self, path, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode('utf-8')
+        request_headers = {'Content-Type': 'application/json'}
+        request_headers.update(headers or {})
+        for attempt in range(2):
+            conn = getattr(self.local, 'conn', None)
+            if conn is None:
+                conn = self.local.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                conn.request('POST', path, body=body, headers=request_headers)
+                response = conn.getresponse()
+                data = response.read()
+                if response.will_close:
+                    conn.close()
+                    self.local.conn = None
+                return response.status, data
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                self.local.conn = None
+                if attempt:
+                    raise
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_load(name, send, total, concurrency):
+    """Call send(i) total times from concurrency threads; return throughput and latency stats"""
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def one(i):
+        nonlocal errors
+        started = time.perf_counter()
+        try:
+            ok = send(i)
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'scenario': name,
+        'requests': total,
+        'concurrency': concurrency,
+        'errors': errors,
+        'rps': total / wall if wall else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def checkout(client, i):
+    package = PACKAGES[i % len(PACKAGES)]
+    status, data = client.post('/api/initialize-payment', {
+        'email': f'bench{i}@example.com',
+        'phone': f'024{i:07d}',
+        'package_id': package['id'],
+    })
+    if status != 200:
+        return None
+    return json.loads(data)
+
+
+def scenario_checkout(client, db, args):
+    """Burst of new checkouts: short-ID allocation, order insert and Paystack initialize"""
+    return run_load('checkout', lambda i: checkout(client, i) is not None, args.requests, args.concurrency)
+
+
+def scenario_verify(client, db, args):
+    """Many buyers polling verify-payment for a handful of orders at once"""
+    short_ids = [result['short_id'] for result in (checkout(client, i) for i in range(20)) if result]
+
+    def send(i):
+        status, _ = client.post('/api/verify-payment', {'reference': short_ids[i % len(short_ids)]})
+        return status == 200
+
+    return run_load('verify', send, args.requests, args.concurrency)
+
+
+def scenario_webhook(client, db, args):
+    """Paystack delivering a flood of signed charge.success webhooks"""
+    orders = [result for result in (checkout(client, i) for i in range(50)) if result]
+
+    def send(i):
+        order = orders[i % len(orders)]
+        body = json.dumps({'event': 'charge.success', 'data': {
+            'id': i,
+            'status': 'success',
+            'reference': order['paystack_reference'],
+            'amount': int(round(order['amount'] * 100)),
+        }}).encode('utf-8')
+        signature = hmac.new(PAYSTACK_SECRET_KEY.encode('utf-8'), body, hashlib.sha512).hexdigest()
+        status, _ = client.post('/api/webhook/paystack', body, {'x-paystack-signature': signature})
+        return status == 200
+
+    return run_load('webhook', send, args.requests, args.concurrency)
+
+
+def scenario_admin_bulk(client, db, args):
+    """Admins moving batches of orders between statuses"""
+    status, data = client.post('/api/admin/login', {'admin_token': ADMIN_TOKEN})
+    session_token = json.loads(data)['session_token']
+    while len(db.tables['orders']) < args.bulk_size:
+        checkout(client, len(db.tables['orders']))
+    with db.lock:
+        for order in db.tables['orders']:
+            order['status'] = 'PAID'  # Paid orders may move on to PROCESSING and FULFILLED
+        order_ids = [order['id'] for order in db.tables['orders']]
+
+    def send(i):
+        batch = random.sample(order_ids, args.bulk_size)
+        status, _ = client.post('/api/admin/orders/bulk-status', {
+            'session_token': session_token,
+            'order_ids': batch,
+            'status': ('PROCESSING', 'FULFILLED')[i % 2],
+        })
+        return status == 200
+
+    return run_load('admin-bulk', send, max(1, args.requests // 10), max(1, args.concurrency // 4))
+
+
+SCENARIO_RUNNERS = {
+    'checkout': scenario_checkout,
+    'verify': scenario_verify,
+    'webhook': scenario_webhook,
+    'admin-bulk': scenario_admin_bulk,
+}
+
+
+# --- Orchestration ---
+
+def free_port():
+    with socketserver.TCPServer(('127.0.0.1', 0), None) as probe:
+        return probe.server_address[1]
+
+
+def wait_until_serving(base_url, process, timeout=30):
+    """Wait for /readyz, so scenarios measure a warmed-up server"""
+    parsed = urlparse(base_url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'server.py exited with code {process.returncode}')
+        try:
+            conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=1)
+            conn.request('GET', '/readyz')
+            status = conn.getresponse().status
+            conn.close()
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError('server.py did not become ready in time')
+
+
+def start_server(supabase_url, paystack_url, workdir, args):
+    port = free_port()
+    env = dict(os.environ)
+    env.update({
+        'PORT': str(port),
+        'SUPABASE_URL': supabase_url,
+        'PAYSTACK_API_URL': paystack_url,
+        'PAYSTACK_SECRET_KEY': PAYSTACK_SECRET_KEY,
+        'SUPABASE_SERVICE_ROLE_KEY': 'benchmark-service-role-key',
+        'WEBHOOK_JOURNAL_PATH': os.path.join(workdir, 'webhook_journal.db'),
+        'SESSION_DB_PATH': os.path.join(workdir, 'admin_sessions.db'),
+        'LOG_LEVEL': args.server_log_level,
+        'WORKER_PROCESSES': str(args.worker_processes),
+        # Every simulated buyer shares 127.0.0.1, so per-client and per-order rate limits are off
+        'RATE_LIMIT_IP_RATE': '0',
+        'RATE_LIMIT_ORDER_RATE': '0',
+    })
+    log_file = open(os.path.join(workdir, 'server.log'), 'w')
+    process = subprocess.Popen([sys.executable, SERVER_SCRIPT], cwd=workdir, env=env,
+                               stdout=log_file, stderr=subprocess.STDOUT)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        wait_until_serving(base_url, process)
+    except RuntimeError:
+        process.kill()
+        raise
+    return process, base_url
+
+
+def print_results(results):
+    print(f'{"scenario":<12} {"requests":>8} {"conc":>5} {"errors":>6} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9}')
+    for r in results:
+        print(f'{r["scenario"]:<12} {r["requests"]:>8} {r["concurrency"]:>5} {r["errors"]:>6} '
+              f'{r["rps"]:>9.1f} {r["p50_ms"]:>9.1f} {r["p95_ms"]:>9.1f} {r["p99_ms"]:>9.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scenarios', nargs='*', help=f'Scenarios to run: {", ".join(SCENARIOS)} (default: all)')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients')
+    parser.add_argument('--supabase-latency', type=float, default=0.03, help='Mean injected Supabase latency (seconds)')
+    parser.add_argument('--paystack-latency', type=float, default=0.15, help='Mean injected Paystack latency (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.2, help='Latency standard deviation as a fraction of the mean')
+    parser.add_argument('--bulk-size', type=int, default=200, help='Orders per admin bulk update')
+    parser.add_argument('--worker-processes', type=int, default=1, help='WORKER_PROCESSES for server.py (0 = one per CPU)')
+    parser.add_argument('--server-log-level', default='WARNING', help='LOG_LEVEL for server.py')
+    parser.add_argument('--json', help='Also write results to this file')
+    parser.add_argument('--fakes-only', action='store_true', help='Only run the fake upstreams and print their URLs')
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f'unknown scenario(s): {", ".join(sorted(unknown))}')
+
+    db = FakeDatabase()
+    supabase, supabase_url = start_fake(FakeSupabaseHandler, db=db,
+                                        latency=args.supabase_latency, jitter=args.jitter)
+    paystack, paystack_url = start_fake(FakePaystackHandler, transactions={},
+                                        latency=args.paystack_latency, jitter=args.jitter)
+
+    if args.fakes_only:
+        print(f'SUPABASE_URL={supabase_url} PAYSTACK_API_URL={paystack_url} '
+              f'PAYSTACK_SECRET_KEY={PAYSTACK_SECRET_KEY} SUPABASE_SERVICE_ROLE_KEY=benchmark python server.py')
+        print(f'Admin token: {ADMIN_TOKEN}. Press Ctrl+C to stop.')
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            return
+
+    with tempfile.TemporaryDirectory(prefix='datagod-bench-') as workdir:
+        process, base_url = start_server(supabase_url, paystack_url, workdir, args)
+        try:
+            client = Client(base_url)
+            print(f'server.py on {base_url}; Supabase latency {args.supabase_latency * 1000:.0f}ms, '
+                  f'Paystack latency {args.paystack_latency * 1000:.0f}ms')
+            results = []
+            for name in args.scenarios or SCENARIOS:
+                print(f'Running {name}...', flush=True)
+                results.append(SCENARIO_RUNNERS[name](client, db, args))
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    print()
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'settings': vars(args), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -16,6 +16,12 @@ const ORDER_STATUS = { CANCELLED: 'CANCELLED', PAID: 'PAID', PROCESSING: 'PROCES
 // --- Utility Functions ---
 // (Server now generates all IDs securely)
 
+// One idempotency key per page load: a resubmitted or retried checkout gets the original
+// order back from the server (keys are scoped to email/phone/package server-side)
+const CHECKOUT_IDEMPOTENCY_KEY = (window.crypto && crypto.randomUUID)
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+
 // --- Supabase Interaction Functions ---
 
 /**
@@ -65,45 +71,37 @@ async function fetchSettings() {
  */
 
 /**
- * Queries the database to find an order by Short ID.
+ * Looks up an order by Short ID (served by the server from its local order replica).
  */
 async function findOrderByShortId(shortId) {
-    const { data, error } = await supabaseClient
-        .from('orders')
-        .select('package_details, status') // Only fetch needed fields
-        .eq('short_id', shortId)
-        .single(); 
-
-    if (error && error.code !== 'PGRST116') { 
-        console.error('Error looking up order:', error);
-    }
-    
-    // Map data fields back to original object structure
-    if (data) {
+    try {
+        const response = await fetch(`${window.location.origin}/api/orders/${encodeURIComponent(shortId)}`);
+        if (response.status === 404) {
+            return null;
+        }
+        const result = await response.json();
+        if (!result.success) {
+            console.error('Error looking up order:', result.error);
+            return null;
+        }
+        // Map data fields back to original object structure
         return {
-            packageDetails: data.package_details,
-            status: data.status
+            packageDetails: result.order.package_details,
+            status: result.order.status
         };
+    } catch (error) {
+        console.error('Error looking up order:', error);
+        return null;
     }
-    return null;
 }
 
 
 /**
- * Gets an order's current status from the database.
+ * Gets an order's current status.
  */
 async function getOrderStatus(shortId) {
-    const { data, error } = await supabaseClient
-        .from('orders')
-        .select('status')
-        .eq('short_id', shortId)
-        .single();
-
-    if (error) {
-        console.error('Error fetching order status:', error);
-        return null;
-    }
-    return data;
+    const order = await findOrderByShortId(shortId);
+    return order ? { status: order.status } : null;
 }
 
 // --- Status Checker Logic (NO CHANGE NEEDED) ---
@@ -204,7 +202,9 @@ async function autoVerifyOnPageLoad() {
                 console.log('[AUTO-VERIFY] ✓ Payment verified automatically!');
                 showSuccessScreen(lastOrderRef, 'MTN Package');
             } else {
-                console.log('[AUTO-VERIFY] Payment not confirmed yet, user can verify manually');
+                console.log('[AUTO-VERIFY] Payment not confirmed yet, waiting for confirmation...');
+                showWaitingScreen(lastOrderRef, 'MTN Package');
+                watchOrderStatus(lastOrderRef, 'MTN Package');
             }
         } catch (error) {
             console.log('[AUTO-VERIFY] Error during auto-verification:', error);
@@ -324,7 +324,10 @@ async function handleOrderSubmission(event) {
         
         const response = await fetch(initUrl, {
             method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
+            headers: {
+                'Content-Type': 'application/json',
+                'Idempotency-Key': CHECKOUT_IDEMPOTENCY_KEY
+            },
             body: JSON.stringify({
                 package_id: selectedPackage.id,
                 phone: customerPhone,
@@ -481,6 +484,72 @@ async function autoVerifyPayment(shortId) {
     }
 }
 
+/**
+ * Polls the backend every 2 seconds (fallback when event streams are unavailable)
+ */
+function startAutoVerifyPolling(shortId) {
+    autoVerifyAttempts = 0;
+    autoVerifyIntervalId = setInterval(() => {
+        autoVerifyAttempts++;
+        if (autoVerifyAttempts > MAX_VERIFY_ATTEMPTS) {
+            console.log('[AUTO-VERIFY] Giving up automatic verification, user can verify manually');
+            clearInterval(autoVerifyIntervalId);
+            autoVerifyIntervalId = null;
+            return;
+        }
+        autoVerifyPayment(shortId);
+    }, 2000);
+}
+
+// Open order status stream (server pushes status changes instead of us polling)
+let orderEventSource = null;
+
+/**
+ * Waits for the server to push the order's PAID status over Server-Sent Events
+ */
+function watchOrderStatus(shortId, packageName) {
+    if (!window.EventSource) {
+        startAutoVerifyPolling(shortId);
+        return;
+    }
+    
+    console.log('[ORDER-EVENTS] Watching status for:', shortId);
+    orderEventSource = new EventSource(`${window.location.origin}/api/orders/${shortId}/events`);
+    
+    orderEventSource.addEventListener('status', (event) => {
+        const { status } = JSON.parse(event.data);
+        console.log('[ORDER-EVENTS] Status update:', status);
+        
+        if (status !== ORDER_STATUS.CANCELLED) {
+            showSuccessScreen(shortId, packageName);
+        }
+    });
+    
+    orderEventSource.addEventListener('timeout', () => {
+        console.log('[ORDER-EVENTS] Stream timed out, user can verify manually');
+        stopWatchingOrderStatus();
+    });
+    
+    orderEventSource.onerror = () => {
+        // CLOSED means the server refused the stream (e.g. at capacity); otherwise the browser reconnects
+        if (orderEventSource && orderEventSource.readyState === EventSource.CLOSED) {
+            console.log('[ORDER-EVENTS] Stream unavailable, falling back to polling');
+            stopWatchingOrderStatus();
+            startAutoVerifyPolling(shortId);
+        }
+    };
+}
+
+/**
+ * Closes the order status stream, if open
+ */
+function stopWatchingOrderStatus() {
+    if (orderEventSource) {
+        orderEventSource.close();
+        orderEventSource = null;
+    }
+}
+
 /**
  * Shows waiting screen with automatic verification indicator
  */
@@ -589,6 +658,9 @@ async function verifyManualPayment(shortId, packageName) {
 function showSuccessScreen(shortId, packageName) {
     console.log('showSuccessScreen called with shortId:', shortId, 'packageName:', packageName);
     
+    // Payment is confirmed - no need to keep listening for status changes
+    stopWatchingOrderStatus();
+    
     // Remove all Paystack elements forcefully
     const paystackElements = document.querySelectorAll('iframe[src*="paystack"], iframe[name*="paystack"], .paystack-overlay, .paystack-container');
     paystackElements.forEach(el => {